@@ -40,35 +40,90 @@ def get_data(url: str, data_path: Path) -> bytes:
         sys.exit(1)
 
 
-def create_dataset(data_path: Path, class1_start: int, class1_end: int, class2_start: int, class2_end: int,
-                   cols: list) -> pd.DataFrame:
+def _parse_record(line: str, n_cols: int) -> list:
+    """Parses a line of the acquired data as a numeric record
+
+    Args:
+        line: Line of the acquired data file
+        n_cols: Number of values expected on each record
+
+    Returns:
+        List of floats, or None if the line is not a record with n_cols values
+
+    """
+
+    tokens = line.split()
+    if len(tokens) != n_cols:
+        return None
+    try:
+        return [float(t) for t in tokens]
+    except ValueError:
+        return None
+
+
+def find_sections(lines: list, n_cols: int) -> list:
+    """Locates and parses the contiguous blocks of numeric records within the raw data
+
+    Args:
+        lines: Lines of the acquired data file
+        n_cols: Number of values expected on each record
+
+    Returns:
+        List of (start, end, records) tuples, one per section, in file order, where
+        records holds the parsed values of lines[start:end]
+
+    """
+
+    sections = []
+    start = None
+    records = []
+    for i, line in enumerate(lines):
+        record = _parse_record(line, n_cols)
+
+        if record is not None:
+            if start is None:
+                start = i
+            records.append(record)
+        elif start is not None:
+            sections.append((start, i, records))
+            start = None
+            records = []
+
+    if start is not None:
+        sections.append((start, len(lines), records))
+
+    return sections
+
+
+def create_dataset(data_path: Path, cols: list, seed: int = None) -> pd.DataFrame:
     """Converts acquired data into dataframe
 
     Args:
         data_path: Path (including data file name) where the acquired data is stored
-        class1_start: Starting index for first class within the dataset
-        class1_end: Ending index for first class within the dataset
-        class2_start: Starting index for second class within the dataset
-        class2_end: Ending index for second class within the dataset
         cols: List of column names
+        seed: Seed for the random class labels (default = None, i.e. not reproducible)
 
     """
 
     try:
         with open(data_path, 'r') as f:
-            data = [[s for s in line.split(' ') if s!=''] for line in f.readlines()]
-
-        class1 = data[class1_start:class1_end]
-        class1 = [[float(r.replace('/n', '')) for r in record] for record in class1]
-        class1 = pd.DataFrame(class1, columns=cols)
-        class1['class'] = np.random.choice([0,1], size=len(class1))
-
-        class2 = data[class2_start:class2_end]
-        class2 = [[float(r.replace('/n', '')) for r in record] for record in class2]
-        class2 = pd.DataFrame(class2, columns=cols)
-        class2['class'] = np.random.choice([0,1], size=len(class1))
-
-        df = pd.concat([class1, class2])
+            lines = f.readlines()
+
+        sections = find_sections(lines, len(cols))
+        if not sections:
+            logger.error('Dataframe could not be created: no %d-column records found in %s', len(cols), data_path)
+            sys.exit(1)
+        logger.info('Found %d sections in %s: %s', len(sections), data_path,
+                    [(start, end) for start, end, _ in sections])
+
+        rng = np.random.default_rng(seed)
+        frames = []
+        for _, _, records in sections:
+            section = pd.DataFrame(np.array(records, dtype=float), columns=cols)
+            section['class'] = rng.integers(0, 2, size=len(section))
+            frames.append(section)
+
+        df = pd.concat(frames)
 
         logger.info('Dataframe successfully created')
 
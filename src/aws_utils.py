@@ -8,6 +8,42 @@ logging.getLogger('s3transfer').setLevel(logging.INFO)
 logging.getLogger('boto3').setLevel(logging.INFO)
 logging.getLogger('urllib3').setLevel(logging.INFO)
 
+def get_s3_client():
+    """Creates an S3 client from the default boto3 session
+
+    Returns:
+        boto3 S3 client
+    """
+    session = boto3.Session()
+    return session.client('s3')
+
+
+def upload_artifact(file_path: Path, config: dict, s3=None) -> str:
+    """Upload a single artifact to S3
+
+    Args:
+        file_path: Path of the artifact to upload
+        config: Config required to upload artifacts to S3; see example config file for structure
+        s3: S3 client to upload with (default = None, a new client is created)
+
+    Returns:
+        S3 uri of the uploaded file
+    """
+    if s3 is None:
+        s3 = get_s3_client()
+
+    bucket_name = config['aws']['bucket_name']
+
+    # Construct S3 key (object key)
+    s3_key = str(Path(file_path).name)
+
+    # Upload file to S3
+    s3.upload_file(str(file_path), bucket_name, s3_key)
+    logger.debug('Uploaded %s to s3://%s/%s', file_path, bucket_name, s3_key)
+
+    return f"s3://{bucket_name}/{s3_key}"
+
+
 def upload_artifacts(artifacts: Path, config: dict) -> list[str]:
     """Upload all the artifacts in the specified directory to S3
 
@@ -19,28 +55,21 @@ def upload_artifacts(artifacts: Path, config: dict) -> list[str]:
     Returns:
         List of S3 uri's for each file that was uploaded
     """
-    session = boto3.Session()
-    s3 = session.client('s3')
+    s3 = get_s3_client()
 
     try:
         # List of uploaded file paths
         uploaded_files = []
-        bucket_name = config['aws']['bucket_name']
 
         artifacts_path = Path(artifacts)
 
         # Iterate over files in the directory
         for file_path in artifacts_path.glob('*'):
             if file_path.is_file():
-                # Construct S3 key (object key)
-                s3_key = str(file_path.name)
-
-                # Upload file to S3
-                print('KEY NAME:',s3_key)
-                s3.upload_file(str(file_path), bucket_name, s3_key)
+                print('KEY NAME:', file_path.name)
 
-                # Append S3 URI to the list
-                uploaded_files.append(f"s3://{bucket_name}/{s3_key}")
+                # Upload file to S3 and append S3 URI to the list
+                uploaded_files.append(upload_artifact(file_path, config, s3))
 
         logger.info('Artifacts successfully uploaded to s3!')
         return uploaded_files
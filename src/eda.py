@@ -6,6 +6,12 @@ from pathlib import Path
 import re
 import yaml
 import pandas as pd
+import matplotlib
+
+# Figures are only saved to disk, and may be drawn outside the main thread in async mode
+matplotlib.use('Agg')
+
+# pylint: disable=wrong-import-position
 import matplotlib.pyplot as plt
 
 logger = logging.getLogger(__name__)
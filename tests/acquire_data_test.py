@@ -0,0 +1,82 @@
+from pathlib import Path
+import pickle
+import sys
+import pandas as pd
+import pytest
+
+parent_dir = Path(__file__).resolve().parent.parent
+src_dir = parent_dir / 'src'
+sys.path.append(str(src_dir))
+
+# pylint: disable=wrong-import-position
+import acquire_data
+
+cols = ['a', 'b', 'c']
+
+raw_data = '''Cloud data
+First class follows
+
+ 1.0  2.0  3.0
+ 4.0  5.0  6.0
+ 7.0  8.0  9.0
+
+Second class follows
+10.0 11.0 12.0
+13.0 14.0 15.0
+'''
+
+
+@pytest.fixture
+def data_path(tmp_path):
+    path = tmp_path / 'data.txt'
+    path.write_text(raw_data)
+    return path
+
+
+def test_find_sections():
+    '''
+    Unit Testing
+
+    Purpose of function: locate and parse each contiguous block of numeric records in the raw data.
+    '''
+    lines = raw_data.splitlines(keepends=True)
+    sections = acquire_data.find_sections(lines, len(cols))
+    assert [(start, end) for start, end, _ in sections] == [(3, 6), (8, 10)]
+    assert sections[1][2] == [[10.0, 11.0, 12.0], [13.0, 14.0, 15.0]]
+
+def test_create_dataset_sections(data_path):
+    '''
+    Unit Testing
+
+    Purpose of function: build a dataframe containing every record of every section, labelled with a class.
+    '''
+    df = acquire_data.create_dataset(data_path, cols, seed=0)
+    assert len(df) == 5
+    assert list(df.columns) == cols + ['class']
+    assert df['class'].isin([0, 1]).all()
+
+def test_create_dataset_seeded(data_path):
+    '''
+    Unit Testing
+
+    Purpose of function: the same seed must always produce the same dataset, down to the saved bytes.
+    '''
+    df1 = acquire_data.create_dataset(data_path, cols, seed=42)
+    df2 = acquire_data.create_dataset(data_path, cols, seed=42)
+    pd.testing.assert_frame_equal(df1, df2)
+    assert pickle.dumps(df1) == pickle.dumps(df2)
+
+    acquire_data.save_dataset(df1, data_path.parent / 'first.txt')
+    acquire_data.save_dataset(df2, data_path.parent / 'second.txt')
+    assert (data_path.parent / 'first.pkl').read_bytes() == (data_path.parent / 'second.pkl').read_bytes()
+
+def test_create_dataset_no_sections(tmp_path):
+    '''
+    Unit Testing
+
+    Purpose of function: a file without any records of the expected width cannot be turned into a dataset.
+    '''
+    path = tmp_path / 'data.txt'
+    path.write_text('no numeric records here\n')
+    with pytest.raises(SystemExit):
+        acquire_data.create_dataset(path, cols, seed=0)
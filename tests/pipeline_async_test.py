@@ -0,0 +1,205 @@
+from pathlib import Path
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import asyncio
+import logging
+import os
+import re
+import sys
+import threading
+import time
+import pytest
+import yaml
+
+parent_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(parent_dir))
+
+# pylint: disable=wrong-import-position
+import pipeline
+
+n_cols = 10
+raw_data = 'Cloud data\n\n' + '\n'.join(
+    ' '.join(f'{(i % 7 + j + 1) * 1.5:.2f}' for j in range(n_cols)) for i in range(60)
+) + '\n\nSecond section\n' + '\n'.join(
+    ' '.join(f'{(i % 5 + j + 2) * 2.5:.2f}' for j in range(n_cols)) for i in range(60)
+) + '\n'
+
+
+class DataHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = raw_data.encode()
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args): # pylint: disable=redefined-builtin
+        pass
+
+
+class StubS3:
+    def __init__(self, artifacts_path, delay=0.05):
+        self.artifacts_path = artifacts_path
+        self.delay = delay
+        self.uploaded = []
+        self.lock = threading.Lock()
+
+    def upload_file(self, filename, bucket, key):
+        contents = Path(filename).read_bytes()
+        time.sleep(self.delay)
+        metrics_written = (self.artifacts_path / 'model_metrics.joblib').exists()
+        with self.lock:
+            self.uploaded.append((key, bucket, contents, metrics_written))
+
+
+@pytest.fixture
+def data_url():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), DataHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_port}/cloud.data'
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def config(data_url):
+    with open(parent_dir / 'config' / 'config.yaml', 'r') as file:
+        config = yaml.safe_load(file)
+    config['run_config']['data_source'] = data_url
+    config['aws']['upload'] = True
+    config['aws']['bucket_name'] = 'test-bucket'
+    config['async_pipeline'] = {'enabled': True, 'max_concurrency': 2}
+    return config
+
+
+@pytest.fixture
+def artifacts_path(tmp_path, monkeypatch):
+    (tmp_path / 'artifacts').mkdir()
+    (tmp_path / 'data').mkdir()
+    monkeypatch.setattr(pipeline, 'parent_dir', tmp_path)
+    return tmp_path / 'artifacts'
+
+
+@pytest.fixture
+def s3(artifacts_path, monkeypatch):
+    stub = StubS3(artifacts_path)
+    monkeypatch.setattr(pipeline.aws_utils, 'get_s3_client', lambda: stub)
+    return stub
+
+
+def test_main_async_uploads_every_artifact(artifacts_path, s3, config):
+    '''
+    Unit Testing
+
+    Purpose of function: run the whole pipeline with asyncio, downloading from a local HTTP server
+    and uploading every artifact written to the artifacts directory exactly once.
+    '''
+    asyncio.run(pipeline.main_async(config))
+
+    artifacts = sorted(p.name for p in artifacts_path.glob('*'))
+    assert (artifacts_path.parent / 'data' / 'data.txt').read_text() == raw_data
+    assert 'rf_classifer.joblib' in artifacts
+    assert sorted(key for key, _, _, _ in s3.uploaded) == artifacts
+    assert all(bucket == 'test-bucket' for _, bucket, _, _ in s3.uploaded)
+
+def test_main_async_overlaps_uploads_with_stages(artifacts_path, s3, config, monkeypatch, caplog):
+    '''
+    Unit Testing
+
+    Purpose of function: early artifacts must be uploaded while later stages are still running,
+    and with slow uploads the estimated time saved over a serial run must be positive.
+    '''
+    s3.delay = 0.2
+    train = pipeline.train_model.train_model
+
+    def slow_train(*args):
+        time.sleep(0.5)
+        return train(*args)
+    monkeypatch.setattr(pipeline.train_model, 'train_model', slow_train)
+
+    with caplog.at_level(logging.INFO):
+        asyncio.run(pipeline.main_async(config))
+
+    metrics_written = {key: written for key, _, _, written in s3.uploaded}
+    assert metrics_written['config.yaml'] is False
+    assert metrics_written['dataset.pkl'] is False
+    saved = re.search(r'an estimated (-?[0-9.]+)s saved', caplog.text)
+    assert saved is not None
+    assert float(saved.group(1)) > 0
+
+def test_main_async_skips_stale_artifacts(artifacts_path, s3, config):
+    '''
+    Unit Testing
+
+    Purpose of function: artifacts left by an earlier run must not be uploaded; once rewritten
+    each key is uploaded exactly once with the current contents.
+    '''
+    stale_file = artifacts_path / 'config.yaml'
+    stale_file.write_bytes(b'stale')
+    os.utime(stale_file, (1, 1))
+
+    asyncio.run(pipeline.main_async(config))
+
+    keys = [key for key, _, _, _ in s3.uploaded]
+    assert len(keys) == len(set(keys))
+    assert sorted(keys) == sorted(p.name for p in artifacts_path.glob('*'))
+    contents = {key: body for key, _, body, _ in s3.uploaded}
+    assert contents['config.yaml'] == stale_file.read_bytes() != b'stale'
+
+def test_main_async_without_upload(artifacts_path, config, monkeypatch):
+    '''
+    Unit Testing
+
+    Purpose of function: with uploads disabled no S3 client is created.
+    '''
+    config['aws']['upload'] = False
+
+    def no_client():
+        raise AssertionError('S3 client should not be created')
+    monkeypatch.setattr(pipeline.aws_utils, 'get_s3_client', no_client)
+
+    asyncio.run(pipeline.main_async(config))
+    assert (artifacts_path / 'model_metrics.joblib').exists()
+
+def test_main_sync(artifacts_path, s3, config):
+    '''
+    Unit Testing
+
+    Purpose of function: run the default (sync) pipeline from its config file, downloading from a
+    local HTTP server and uploading every artifact once the run has finished.
+    '''
+    config['async_pipeline']['enabled'] = False
+    (artifacts_path.parent / 'config').mkdir()
+    with open(artifacts_path.parent / 'config' / 'config.yaml', 'w') as file:
+        yaml.safe_dump(config, file)
+
+    pipeline.main()
+
+    artifacts = sorted(p.name for p in artifacts_path.glob('*'))
+    assert (artifacts_path.parent / 'data' / 'data.txt').read_text() == raw_data
+    assert 'model_metrics.joblib' in artifacts
+    assert sorted(key for key, _, _, _ in s3.uploaded) == artifacts
+    assert all(written for _, _, _, written in s3.uploaded)
+
+def test_validate_config_missing_entry(config):
+    '''
+    Unit Testing
+
+    Purpose of function: a config missing an entry the pipeline reads must stop the run
+    before any stage starts.
+    '''
+    del config['run_config']['data_source']
+    with pytest.raises(SystemExit):
+        pipeline.validate_config(config)
+
+@pytest.mark.parametrize('max_concurrency', [0, -1, 1.5, True])
+def test_validate_config_bad_max_concurrency(config, max_concurrency):
+    '''
+    Unit Testing
+
+    Purpose of function: async_pipeline.max_concurrency must be a positive integer, otherwise
+    no upload could ever start.
+    '''
+    config['async_pipeline']['max_concurrency'] = max_concurrency
+    with pytest.raises(SystemExit):
+        pipeline.validate_config(config)